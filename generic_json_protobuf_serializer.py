@@ -1,12 +1,624 @@
+"""
+Generic JSON <-> Protocol Buffers serialization based on google.protobuf.Struct.
+
+The protobuf package is a hard requirement and must be installed beforehand,
+ideally with its upb or C++ extension (a RuntimeWarning is issued otherwise);
+msgspec or orjson (tried in that order) and ijson are optional and enable
+faster JSON I/O and streaming conversion respectively.
+"""
+
 import json
+import math
+import mmap
 import os
-import subprocess
-from typing import Any, Dict, List, Optional, Union
+import struct
+import sys
+import threading
+import warnings
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import repeat
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 from google.protobuf.descriptor import FieldDescriptor
-from google.protobuf import json_format
+from google.protobuf.internal import api_implementation
 from google.protobuf.json_format import ParseError
 from google.protobuf.struct_pb2 import Struct
 
+# protobuf already prefers the upb/C++ backends when they are installed, so
+# only warn when it had to fall back to the much slower pure-Python one
+if api_implementation.Type() == 'python':
+    warnings.warn(
+        "protobuf is using its pure-Python implementation, which is 10-100x slower; "
+        "install a protobuf wheel with the upb or C++ extension for faster conversions",
+        RuntimeWarning,
+    )
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+def _stdlib_encode_json(data: Any, pretty: bool) -> bytes:
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+
+def _has_non_finite(data: Any) -> bool:
+    """
+    Return True if data contains a NaN or infinite float anywhere.
+    """
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+# JSON codec, chosen once from the fastest installed library. msgspec and
+# orjson write NaN and Infinity as null, so output containing null is checked
+# and re-encoded with the stdlib, which writes them as the baseline did.
+if msgspec is not None:
+    _MSGSPEC_ENCODER = msgspec.json.Encoder()
+    
+    def _decode_json(data: Union[str, bytes]) -> Any:
+        try:
+            return msgspec.json.decode(data)
+        except msgspec.DecodeError:
+            # msgspec errors carry no document position, let the stdlib report the error
+            return json.loads(data)
+    
+    def _encode_json(data: Any, pretty: bool) -> bytes:
+        encoded = _MSGSPEC_ENCODER.encode(data)
+        if b'null' in encoded and _has_non_finite(data):
+            return _stdlib_encode_json(data, pretty)
+        return msgspec.json.format(encoded, indent=2) if pretty else encoded
+elif orjson is not None:
+    def _decode_json(data: Union[str, bytes]) -> Any:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson rejects NaN and Infinity, which the stdlib accepts
+            return json.loads(data)
+    
+    def _encode_json(data: Any, pretty: bool) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        try:
+            encoded = orjson.dumps(data, option=option)
+        except TypeError:
+            # orjson cannot encode ints beyond 64 bits
+            return _stdlib_encode_json(data, pretty)
+        if b'null' in encoded and _has_non_finite(data):
+            return _stdlib_encode_json(data, pretty)
+        return encoded
+else:
+    _decode_json = json.loads
+    
+    def _encode_json(data: Any, pretty: bool) -> bytes:
+        return _stdlib_encode_json(data, pretty)
+
+
+def _build_struct(py_obj: Dict[str, Any], struct_msg: Struct) -> None:
+    """
+    Fill a Struct message directly from a Python dict.
+    
+    Assigns each field through the matching Value oneof instead of going
+    through the reflection-based json_format.ParseDict. Struct.update() is
+    not used either: it is a pure-Python helper even on the upb backend and
+    does the same isinstance dispatch without the inlined fast paths below.
+    
+    Args:
+        py_obj: The dict to copy into the Struct
+        struct_msg: The Struct message to fill
+        
+    Raises:
+        ParseError: If a value has a type that cannot be represented in a Struct
+    """
+    fields = struct_msg.fields
+    for key, value in py_obj.items():
+        # Strings and numbers are assigned inline, skipping a _set_value call
+        value_type = type(value)
+        if value_type is str:
+            fields[key].string_value = value
+        elif value_type is float or value_type is int:
+            fields[key].number_value = value
+        else:
+            _set_value(fields[key], value)
+
+
+# Wire-format prefix of one ListValue.values entry holding a number_value:
+# field 1 (length-delimited, 9 bytes) wrapping field 2 (fixed64 double)
+_NUMBER_ENTRY_PREFIX = b'\n\t\x11'
+_NUMBER_TYPES = frozenset((int, float))
+# Precompiled packers for one entry and for a fixed-size chunk of entries, so
+# packing never compiles (and struct's module cache never keeps) a format
+# whose size grows with the list
+_NUMBER_ENTRY = struct.Struct('<3sd')
+_NUMBER_CHUNK_SIZE = 1024
+# Below this length the per-element loop is faster than packing and merging
+_NUMBER_BULK_MIN = 128
+_NUMBER_CHUNK = struct.Struct('<' + '3sd' * _NUMBER_CHUNK_SIZE)
+
+
+def _merge_number_list(list_msg: Any, items: Union[List[Any], Tuple[Any, ...]]) -> bool:
+    """
+    Bulk-fill a ListValue from a list made only of ints and floats.
+    
+    The entries are packed into wire format a chunk at a time and merged at
+    once, instead of adding and assigning a Value per element.
+    
+    Returns:
+        True if the list was merged, False if it is shorter than _NUMBER_BULK_MIN
+        or isn't made only of numbers
+    """
+    count = len(items)
+    if count < _NUMBER_BULK_MIN or type(items[0]) not in _NUMBER_TYPES or not set(map(type, items)) <= _NUMBER_TYPES:
+        return False
+    
+    full = count - count % _NUMBER_CHUNK_SIZE
+    parts = []
+    try:
+        if full:
+            pack_chunk = _NUMBER_CHUNK.pack
+            args = [_NUMBER_ENTRY_PREFIX] * (2 * _NUMBER_CHUNK_SIZE)
+            for start in range(0, full, _NUMBER_CHUNK_SIZE):
+                args[1::2] = items[start:start + _NUMBER_CHUNK_SIZE]
+                parts.append(pack_chunk(*args))
+        parts.append(b''.join(map(_NUMBER_ENTRY.pack, repeat(_NUMBER_ENTRY_PREFIX), items[full:])))
+    except (OverflowError, struct.error):
+        # Ints too large for a double; let the per-element path report them
+        return False
+    list_msg.MergeFromString(b''.join(parts))
+    return True
+
+
+def _set_value(value_msg: Any, py_obj: Any) -> None:
+    """
+    Assign a Python value to a google.protobuf.Value message.
+    
+    Args:
+        value_msg: The Value message to fill
+        py_obj: The Python value to assign
+        
+    Raises:
+        ParseError: If the value has a type that cannot be represented in a Struct
+    """
+    # bool must be checked before int since bool is a subclass of int
+    if py_obj is None:
+        value_msg.null_value = 0
+    elif isinstance(py_obj, bool):
+        value_msg.bool_value = py_obj
+    elif isinstance(py_obj, str):
+        value_msg.string_value = py_obj
+    elif isinstance(py_obj, (int, float)):
+        value_msg.number_value = py_obj
+    elif isinstance(py_obj, dict):
+        struct_value = value_msg.struct_value
+        struct_value.SetInParent()
+        _build_struct(py_obj, struct_value)
+    elif isinstance(py_obj, (list, tuple)):
+        list_value = value_msg.list_value
+        list_value.SetInParent()
+        if not _merge_number_list(list_value, py_obj):
+            add = list_value.values.add
+            for item in py_obj:
+                if type(item) is str:
+                    add().string_value = item
+                else:
+                    _set_value(add(), item)
+    else:
+        raise ParseError(f"Unexpected type for Value message: {type(py_obj).__name__}")
+
+
+def _fill_null(value_msg: Any, py_obj: Any) -> None:
+    if py_obj is None:
+        value_msg.null_value = 0
+    else:
+        _set_value(value_msg, py_obj)
+
+
+def _fill_bool(value_msg: Any, py_obj: Any) -> None:
+    if type(py_obj) is bool:
+        value_msg.bool_value = py_obj
+    else:
+        _set_value(value_msg, py_obj)
+
+
+def _fill_string(value_msg: Any, py_obj: Any) -> None:
+    if type(py_obj) is str:
+        value_msg.string_value = py_obj
+    else:
+        _set_value(value_msg, py_obj)
+
+
+def _fill_number(value_msg: Any, py_obj: Any) -> None:
+    value_type = type(py_obj)
+    if value_type is float or value_type is int:
+        value_msg.number_value = py_obj
+    else:
+        _set_value(value_msg, py_obj)
+
+
+def _compile_value_plan(sample: Any) -> Callable[[Any, Any], None]:
+    """
+    Compile a function filling a Value message from values shaped like sample.
+    
+    Each filler only checks the exact type it expects and hands anything else
+    to the generic _set_value, so a plan is always correct, just slower when
+    the data drifts from the sample. Lists are planned from their first item.
+    
+    Raises:
+        ParseError: If the sample has a type that cannot be represented in a Struct
+    """
+    if sample is None:
+        return _fill_null
+    if isinstance(sample, bool):
+        return _fill_bool
+    if isinstance(sample, str):
+        return _fill_string
+    if isinstance(sample, (int, float)):
+        return _fill_number
+    
+    if isinstance(sample, dict):
+        if len(sample) > _PLAN_MAX_KEYS:
+            # Wide dicts are usually keyed by data (e.g. record IDs), not by schema
+            return _set_value
+        fill_struct = _compile_struct_plan(sample)
+        
+        def fill(value_msg, py_obj):
+            if type(py_obj) is dict:
+                struct_msg = value_msg.struct_value
+                struct_msg.SetInParent()
+                fill_struct(py_obj, struct_msg)
+            else:
+                _set_value(value_msg, py_obj)
+        return fill
+    
+    if isinstance(sample, (list, tuple)):
+        fill_item = _compile_value_plan(sample[0]) if sample else _set_value
+        
+        def fill(value_msg, py_obj):
+            if type(py_obj) is list or type(py_obj) is tuple:
+                list_msg = value_msg.list_value
+                list_msg.SetInParent()
+                if fill_item is _fill_number and _merge_number_list(list_msg, py_obj):
+                    return
+                add = list_msg.values.add
+                if fill_item is _fill_string:
+                    for item in py_obj:
+                        if type(item) is str:
+                            add().string_value = item
+                        else:
+                            _set_value(add(), item)
+                else:
+                    for item in py_obj:
+                        fill_item(add(), item)
+            else:
+                _set_value(value_msg, py_obj)
+        return fill
+    
+    raise ParseError(f"Unexpected type for Value message: {type(sample).__name__}")
+
+
+def _compile_struct_plan(sample: Dict[str, Any]) -> Callable[[Dict[str, Any], Struct], None]:
+    """
+    Compile a function filling a Struct message from dicts with the same keys as sample.
+    
+    Dicts with a different key set are detected and rebuilt with _build_struct.
+    
+    Raises:
+        ParseError: If the sample has a type that cannot be represented in a Struct
+    """
+    plan = tuple((key, _compile_value_plan(value)) for key, value in sample.items())
+    size = len(plan)
+    
+    def fill_struct(py_obj, struct_msg):
+        if len(py_obj) == size:
+            fields = struct_msg.fields
+            try:
+                for key, fill in plan:
+                    fill(fields[key], py_obj[key])
+                return
+            except KeyError:
+                struct_msg.Clear()
+        _build_struct(py_obj, struct_msg)
+    return fill_struct
+
+
+# LRU of compiled struct plans keyed by the top-level keys of the payload, so
+# repeated payloads with the same schema skip the per-value type dispatch.
+# A plan is only compiled once a signature has been seen before, and dicts
+# wider than _PLAN_MAX_KEYS are never planned, so payloads whose keys never
+# repeat just use _build_struct.
+_PLAN_CACHE_SIZE = 256
+_PLAN_MAX_KEYS = 64
+_plan_cache: "OrderedDict[Tuple[str, ...], Callable[[Dict[str, Any], Struct], None]]" = OrderedDict()
+_seen_signatures: "OrderedDict[Tuple[str, ...], None]" = OrderedDict()
+_plan_cache_lock = threading.Lock()
+
+
+def _struct_plan(py_obj: Dict[str, Any]) -> Optional[Callable[[Dict[str, Any], Struct], None]]:
+    """
+    Return the cached struct plan for py_obj's schema.
+    
+    Returns:
+        The plan, or None if py_obj should be converted with _build_struct
+        because its signature is too wide or has not been seen before
+        
+    Raises:
+        ParseError: If py_obj has a type that cannot be represented in a Struct
+    """
+    if len(py_obj) > _PLAN_MAX_KEYS:
+        return None
+    
+    signature = tuple(py_obj)
+    with _plan_cache_lock:
+        plan = _plan_cache.get(signature)
+        if plan is not None:
+            _plan_cache.move_to_end(signature)
+            return plan
+        if signature not in _seen_signatures:
+            _seen_signatures[signature] = None
+            if len(_seen_signatures) > _PLAN_CACHE_SIZE:
+                _seen_signatures.popitem(last=False)
+            return None
+        del _seen_signatures[signature]
+    
+    # Compile outside the lock so other conversions are not blocked
+    plan = _compile_struct_plan(py_obj)
+    with _plan_cache_lock:
+        _plan_cache[signature] = plan
+        _plan_cache.move_to_end(signature)
+        if len(_plan_cache) > _PLAN_CACHE_SIZE:
+            _plan_cache.popitem(last=False)
+    return plan
+
+
+def _stream_struct(file: Any) -> Struct:
+    """
+    Build a Struct message from a binary JSON stream without materializing a Python dict.
+    
+    Parser events from ijson are written straight into the message, using an
+    explicit stack of the Struct/ListValue nodes currently being filled.
+    
+    Args:
+        file: A binary file object positioned at the start of a JSON object
+        
+    Returns:
+        The Protocol Buffers Struct message
+        
+    Raises:
+        ParseError: If the top-level JSON value is not an object
+        ijson.JSONError: If the stream contains invalid JSON
+    """
+    root = Struct()
+    # basic_parse skips building the dotted prefix string that parse() yields
+    # for every event, which the explicit stack makes redundant. use_float is
+    # left off because the yajl2_c backend then rejects ints beyond int64 and
+    # floats beyond double range, which the dict path accepts; numbers arrive
+    # as int/Decimal and are converted with float() instead.
+    events = ijson.basic_parse(file)
+    event, _ = next(events, (None, None))
+    if event != 'start_map':
+        raise ParseError("Failed to convert JSON to protobuf: expected a JSON object")
+    
+    # Each entry is (node, is_struct); map keys are only tracked for Struct nodes
+    stack = [(root, True)]
+    node, is_struct = root, True
+    key = None
+    for event, value in events:
+        if event == 'map_key':
+            key = value
+            continue
+        if event == 'end_map' or event == 'end_array':
+            stack.pop()
+            if stack:
+                node, is_struct = stack[-1]
+            continue
+        
+        target = node.fields[key] if is_struct else node.values.add()
+        if event == 'string':
+            target.string_value = value
+        elif event == 'number' or event == 'integer' or event == 'double':
+            target.number_value = float(value)
+        elif event == 'boolean':
+            target.bool_value = value
+        elif event == 'null':
+            target.null_value = 0
+        elif event == 'start_map' or event == 'start_array':
+            if is_struct:
+                # A duplicate key replaces the earlier value, as in the dict path,
+                # instead of merging into the existing struct_value/list_value
+                target.Clear()
+            if event == 'start_map':
+                node, is_struct = target.struct_value, True
+            else:
+                node, is_struct = target.list_value, False
+            node.SetInParent()
+            stack.append((node, is_struct))
+    return root
+
+
+def _number_to_py(value_msg: Any) -> float:
+    value = value_msg.number_value
+    if not math.isfinite(value):
+        raise ValueError(f"Fail to serialize {value} for Value.number_value, which would parse as string_value")
+    return value
+
+
+# Maps each Value 'kind' oneof to a function extracting the native Python value.
+# An unset Value is treated as null, matching json_format.MessageToDict.
+_VALUE_GETTERS = {
+    None: lambda value_msg: None,
+    'null_value': lambda value_msg: None,
+    'number_value': _number_to_py,
+    'string_value': lambda value_msg: value_msg.string_value,
+    'bool_value': lambda value_msg: value_msg.bool_value,
+    'struct_value': lambda value_msg: _struct_to_py(value_msg.struct_value),
+    'list_value': lambda value_msg: _list_to_py(value_msg.list_value),
+}
+
+
+def _struct_to_py(struct_msg: Struct) -> Dict[str, Any]:
+    """
+    Convert a Struct message to a Python dict without json_format reflection.
+    
+    Args:
+        struct_msg: The Struct message to convert
+        
+    Returns:
+        The equivalent Python dict
+        
+    Raises:
+        ValueError: If a number_value is Infinity or NaN
+    """
+    getters = _VALUE_GETTERS
+    intern = sys.intern
+    result = {}
+    for key, value in struct_msg.fields.items():
+        result[intern(key)] = getters[value.WhichOneof('kind')](value)
+    return result
+
+
+def _list_to_py(list_msg: Any) -> List[Any]:
+    getters = _VALUE_GETTERS
+    return [getters[value.WhichOneof('kind')](value) for value in list_msg.values]
+
+
+# O_BINARY only exists (and matters) on Windows
+_O_BINARY = getattr(os, 'O_BINARY', 0)
+
+
+def _write_bytes(path: str, data: bytes) -> None:
+    """
+    Write data to path with raw os.write calls, bypassing Python's file buffering.
+    
+    The bytes go to a temporary file next to path, which then replaces it in a
+    single os.replace, so readers see either the old file or the new one and a
+    file memory-mapped by _parse_protobuf_file is never truncated underneath it.
+    A single write normally covers the whole payload; the loop only handles
+    short writes.
+    """
+    directory, name = os.path.split(path)
+    tmp_path = os.path.join(directory, f".{name}.{os.urandom(4).hex()}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | _O_BINARY, 0o644)
+    try:
+        try:
+            view = memoryview(data)
+            size = len(view)
+            pos = 0
+            while pos < size:
+                pos += os.write(fd, view[pos:])
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _parse_protobuf_file(path: str, message: Any) -> None:
+    """
+    Parse a Protocol Buffers file into message through a read-only memory map.
+    
+    The parser reads straight from the mapped pages, so no intermediate
+    userspace copy of the file is made and the OS pages it in on demand.
+    The map is only safe while nobody truncates the file in place: touching
+    pages past the new end raises SIGBUS and kills the process. _write_bytes
+    replaces files atomically for this reason; other writers must do the same.
+    """
+    fd = os.open(path, os.O_RDONLY | _O_BINARY)
+    try:
+        if not os.fstat(fd).st_size:
+            # Empty files cannot be memory-mapped
+            message.ParseFromString(b'')
+            return
+        with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+            message.ParseFromString(view)
+    finally:
+        os.close(fd)
+
+
+def _load_json_file(path: str) -> Any:
+    """
+    Load and parse a JSON file with the fastest available JSON codec.
+    
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        json.JSONDecodeError: If the file contains invalid JSON
+    """
+    try:
+        with open(path, 'rb') as file:
+            return _decode_json(file.read())
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Data file not found: {path}")
+    except json.JSONDecodeError as e:
+        raise json.JSONDecodeError(f"Invalid JSON in {path}: {str(e)}", e.doc, e.pos)
+
+
+def _fill_struct(json_data: Any, proto_struct: Struct) -> None:
+    """
+    Fill an empty Struct message from JSON data, using the cached plan for its schema if there is one.
+    
+    Raises:
+        ParseError: If the JSON cannot be converted to protobuf
+    """
+    if not isinstance(json_data, dict):
+        raise ParseError(f"Failed to convert JSON to protobuf: expected a JSON object, got {type(json_data).__name__}")
+    
+    try:
+        plan = _struct_plan(json_data)
+        if plan is None:
+            _build_struct(json_data, proto_struct)
+        else:
+            plan(json_data, proto_struct)
+    except ParseError as e:
+        raise ParseError(f"Failed to convert JSON to protobuf: {str(e)}")
+
+
+def _convert_json_file(input_path: str, output_path: str, proto_struct: Struct) -> None:
+    """
+    Convert a JSON file to a Protocol Buffers file, filling proto_struct in place.
+    
+    Raises:
+        FileNotFoundError: If the input file doesn't exist
+        json.JSONDecodeError: If the input file contains invalid JSON
+        ParseError: If the JSON cannot be converted to protobuf
+    """
+    json_data = _load_json_file(input_path)
+    proto_struct.Clear()
+    _fill_struct(json_data, proto_struct)
+    _write_bytes(output_path, proto_struct.SerializeToString())
+
+
+def _convert_one(pair: Tuple[str, str]) -> None:
+    """
+    Convert one (input_path, output_path) pair; module-level so process pools can pickle it.
+    """
+    input_path, output_path = pair
+    _convert_json_file(input_path, output_path, Struct())
+
+
 class GenericJsonProtobufSerializer:
     """
     A generalized serializer that can convert any JSON data to Protocol Buffers format
@@ -33,12 +645,8 @@ class GenericJsonProtobufSerializer:
         self.data = None
         self.proto_data = None
         
-        # Ensure protobuf is installed
-        try:
-            import google.protobuf
-        except ImportError:
-            print("Installing protobuf package...")
-            subprocess.check_call(["pip", "install", "protobuf"])
+        # Persistent message reused by conversions that opt in with reuse=True
+        self._scratch_struct = Struct()
     
     def load_data(self) -> Any:
         """
@@ -51,21 +659,21 @@ class GenericJsonProtobufSerializer:
             FileNotFoundError: If the data file doesn't exist
             json.JSONDecodeError: If the file contains invalid JSON
         """
-        try:
-            with open(self.input_file_path, 'r', encoding='utf-8') as file:
-                self.data = json.load(file)
-            return self.data
-        except FileNotFoundError:
-            raise FileNotFoundError(f"Data file not found: {self.input_file_path}")
-        except json.JSONDecodeError as e:
-            raise json.JSONDecodeError(f"Invalid JSON in {self.input_file_path}: {str(e)}", e.doc, e.pos)
+        self.data = _load_json_file(self.input_file_path)
+        return self.data
     
-    def json_to_protobuf(self, json_data: Optional[Any] = None) -> Struct:
+    def json_to_protobuf(self, json_data: Optional[Any] = None, reuse: bool = False) -> Struct:
         """
         Convert JSON data to Protocol Buffers format using google.protobuf.Struct.
         
         Args:
             json_data: Optional JSON data to convert. If None, uses the loaded data.
+            reuse: If True, clear and fill the serializer's persistent Struct instead
+                of allocating a new one. The returned message (and self.proto_data)
+                is then borrowed: the next conversion that reuses it overwrites it,
+                so copy it if it must be kept. If the conversion fails, the
+                persistent Struct is cleared and self.proto_data is reset to None
+                if it referred to it.
             
         Returns:
             The Protocol Buffers Struct message
@@ -79,16 +687,54 @@ class GenericJsonProtobufSerializer:
                 raise ValueError("No data to convert. Call load_data() first or provide json_data.")
             json_data = self.data
         
-        # Create a new Struct message
-        proto_struct = Struct()
+        if reuse:
+            proto_struct = self._scratch_struct
+            proto_struct.Clear()
+        else:
+            # Create a new Struct message
+            proto_struct = Struct()
+        
+        # Convert JSON to Struct
+        try:
+            _fill_struct(json_data, proto_struct)
+        except Exception:
+            if reuse:
+                # Don't leave a half-filled message behind proto_data
+                proto_struct.Clear()
+                if self.proto_data is proto_struct:
+                    self.proto_data = None
+            raise
+        self.proto_data = proto_struct
+        return proto_struct
+    
+    def load_and_convert_streaming(self) -> Struct:
+        """
+        Load the input JSON file and convert it straight to a Struct message.
+        
+        Unlike load_data() followed by json_to_protobuf(), the file is streamed
+        through ijson and never held as a Python dict, so memory stays roughly
+        constant in the size of the input. self.data is left untouched.
+        
+        Returns:
+            The Protocol Buffers Struct message
+            
+        Raises:
+            ImportError: If ijson is not installed
+            FileNotFoundError: If the data file doesn't exist
+            ParseError: If the top-level JSON value is not an object
+            ijson.JSONError: If the file contains invalid JSON
+        """
+        if ijson is None:
+            raise ImportError("Streaming conversion requires the ijson package")
         
         try:
-            # Convert JSON to Struct
-            json_format.ParseDict(json_data, proto_struct)
-            self.proto_data = proto_struct
-            return proto_struct
-        except ParseError as e:
-            raise ParseError(f"Failed to convert JSON to protobuf: {str(e)}")
+            with open(self.input_file_path, 'rb') as file:
+                proto_struct = _stream_struct(file)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Data file not found: {self.input_file_path}")
+        
+        self.proto_data = proto_struct
+        return proto_struct
     
     def save_protobuf(self) -> None:
         """
@@ -97,16 +743,15 @@ class GenericJsonProtobufSerializer:
         Raises:
             ValueError: If no data has been converted to protobuf
         """
-        if not self.proto_data:
+        proto = self.proto_data
+        if proto is None:
             # Try to convert if we have JSON data but haven't converted yet
-            if self.data:
-                self.json_to_protobuf()
-            else:
+            if self.data is None:
                 raise ValueError("No data to save. Call load_data() and json_to_protobuf() first.")
+            proto = self.json_to_protobuf()
         
         # Serialize to binary format
-        with open(self.protobuf_output_path, 'wb') as file:
-            file.write(self.proto_data.SerializeToString())
+        _write_bytes(self.protobuf_output_path, proto.SerializeToString())
     
     def load_protobuf(self) -> Struct:
         """
@@ -118,15 +763,14 @@ class GenericJsonProtobufSerializer:
         Raises:
             FileNotFoundError: If the protobuf file doesn't exist
         """
-        if not os.path.exists(self.protobuf_output_path):
-            raise FileNotFoundError(f"Protobuf file not found: {self.protobuf_output_path}")
-        
         # Create a new Struct message
         proto_struct = Struct()
         
         # Read the existing file
-        with open(self.protobuf_output_path, 'rb') as file:
-            proto_struct.ParseFromString(file.read())
+        try:
+            _parse_protobuf_file(self.protobuf_output_path, proto_struct)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Protobuf file not found: {self.protobuf_output_path}")
         
         self.proto_data = proto_struct
         return proto_struct
@@ -141,20 +785,23 @@ class GenericJsonProtobufSerializer:
         Raises:
             ValueError: If no protobuf data has been loaded
         """
-        if not self.proto_data:
+        proto = self.proto_data
+        if proto is None:
             raise ValueError("No protobuf data to convert. Call load_protobuf() first.")
         
         # Convert Struct to JSON
-        json_data = json_format.MessageToDict(self.proto_data)
+        json_data = _struct_to_py(proto)
         self.data = json_data
         return json_data
     
-    def save_json(self, output_file_path: Optional[str] = None) -> None:
+    def save_json(self, output_file_path: Optional[str] = None, *, pretty: bool = False) -> None:
         """
         Save the JSON data to a file.
         
         Args:
             output_file_path: Path to the output JSON file. If None, uses the default path.
+            pretty: If True, indent the output by 2 spaces. Compact output is the
+                default since it is roughly half the size and 2-3x faster to write.
             
         Raises:
             ValueError: If no JSON data is available
@@ -162,20 +809,46 @@ class GenericJsonProtobufSerializer:
         if output_file_path is None:
             output_file_path = self.json_output_path
             
-        if not self.data:
+        data = self.data
+        if data is None:
             # Try to convert from protobuf if available
-            if self.proto_data:
-                self.protobuf_to_json()
-            else:
+            if self.proto_data is None:
                 raise ValueError("No data to save. Load or convert data first.")
+            data = self.protobuf_to_json()
         
-        with open(output_file_path, 'w', encoding='utf-8') as file:
-            json.dump(self.data, file, indent=2, ensure_ascii=False)
+        # All codecs emit UTF-8 without escaping non-ASCII characters
+        with open(output_file_path, 'wb') as file:
+            file.write(_encode_json(data, pretty))
+    
+    @staticmethod
+    def json_bytes_to_pb_bytes(json_bytes: Union[str, bytes]) -> bytes:
+        """
+        Convert JSON text to Protocol Buffers binary format without touching any serializer state.
+        
+        Args:
+            json_bytes: The JSON document, as str or UTF-8 bytes
+            
+        Returns:
+            The Protocol Buffers binary data
+            
+        Raises:
+            json.JSONDecodeError: If the JSON is invalid
+            ParseError: If the JSON cannot be converted to protobuf
+        """
+        # Parse the JSON text
+        json_data = _decode_json(json_bytes)
+        
+        # Convert to protobuf and return the serialized binary data
+        proto_struct = Struct()
+        _fill_struct(json_data, proto_struct)
+        return proto_struct.SerializeToString()
     
     def convert_string(self, json_string: str) -> bytes:
         """
         Convert a JSON string directly to Protocol Buffers binary format.
         
+        This is a stateless conversion: neither self.data nor self.proto_data is updated.
+        
         Args:
             json_string: The JSON string to convert
             
@@ -186,14 +859,7 @@ class GenericJsonProtobufSerializer:
             json.JSONDecodeError: If the JSON string is invalid
             ParseError: If the JSON cannot be converted to protobuf
         """
-        # Parse the JSON string
-        json_data = json.loads(json_string)
-        
-        # Convert to protobuf
-        proto_struct = self.json_to_protobuf(json_data)
-        
-        # Return the serialized binary data
-        return proto_struct.SerializeToString()
+        return self.json_bytes_to_pb_bytes(json_string)
     
     def convert_file(self, input_path: str, output_path: str) -> None:
         """
@@ -225,6 +891,89 @@ class GenericJsonProtobufSerializer:
             # Restore the original paths
             self.input_file_path = original_input
             self.protobuf_output_path = original_output
+    
+    def convert_files(self, pairs: Iterable[Tuple[str, str]], executor: Optional[Executor] = None) -> None:
+        """
+        Convert a batch of JSON files to Protocol Buffers files.
+        
+        Files are converted without touching the serializer's paths or data.
+        Sequentially, one Struct message owned by the batch is cleared and
+        refilled for every file; with an executor each task fills its own
+        message so file I/O of different files can overlap.
+        
+        Args:
+            pairs: Iterable of (input_path, output_path) tuples
+            executor: Optional executor (e.g. a ThreadPoolExecutor or ProcessPoolExecutor)
+                to run the conversions on
+            
+        Raises:
+            FileNotFoundError: If an input file doesn't exist
+            json.JSONDecodeError: If an input file contains invalid JSON
+            ParseError: If the JSON cannot be converted to protobuf
+        """
+        if executor is None:
+            # Not self._scratch_struct, which self.proto_data may refer to
+            proto_struct = Struct()
+            for input_path, output_path in pairs:
+                _convert_json_file(input_path, output_path, proto_struct)
+        else:
+            for _ in executor.map(_convert_one, pairs):
+                pass
+    
+    def convert_files_parallel(self, pairs: Iterable[Tuple[str, str]], workers: Optional[int] = None) -> None:
+        """
+        Convert a batch of JSON files to Protocol Buffers files on a pool of processes.
+        
+        JSON parsing and Struct building are CPU-bound and hold the GIL, so
+        independent files are spread across processes instead of threads.
+        Pairs are sent to the workers in chunks to amortize IPC overhead, and
+        results are collected in input order, so if several files fail the
+        error raised is the one for the earliest pair. On platforms that spawn
+        worker processes, call this from under an ``if __name__ == "__main__":`` guard.
+        
+        Args:
+            pairs: Iterable of (input_path, output_path) tuples
+            workers: Number of worker processes. If None, uses the number of CPUs.
+            
+        Raises:
+            FileNotFoundError: If an input file doesn't exist
+            json.JSONDecodeError: If an input file contains invalid JSON
+            ParseError: If the JSON cannot be converted to protobuf
+        """
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for _ in executor.map(_convert_one, pairs, chunksize=16):
+                pass
+    
+    def convert_file_streaming(self, input_path: str, output_path: str) -> None:
+        """
+        Convert a large JSON file to a Protocol Buffers file without buffering it as a dict.
+        
+        Args:
+            input_path: Path to the input JSON file
+            output_path: Path to the output Protocol Buffers file
+            
+        Raises:
+            ImportError: If ijson is not installed
+            FileNotFoundError: If the input file doesn't exist
+            ParseError: If the top-level JSON value is not an object
+            ijson.JSONError: If the input file contains invalid JSON
+        """
+        # Save the current paths
+        original_input = self.input_file_path
+        original_output = self.protobuf_output_path
+        
+        try:
+            # Set the new paths
+            self.input_file_path = input_path
+            self.protobuf_output_path = output_path
+            
+            # Stream, convert and save
+            self.load_and_convert_streaming()
+            self.save_protobuf()
+        finally:
+            # Restore the original paths
+            self.input_file_path = original_input
+            self.protobuf_output_path = original_output
 
 
 # Example usage
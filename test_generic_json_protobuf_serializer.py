@@ -0,0 +1,238 @@
+import io
+import json
+import math
+import mmap
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+from google.protobuf.struct_pb2 import ListValue, Struct
+
+import generic_json_protobuf_serializer as serializer
+
+
+def _per_element(items):
+    list_msg = ListValue()
+    add = list_msg.values.add
+    for item in items:
+        add().number_value = item
+    return list_msg
+
+
+class MergeNumberListTest(unittest.TestCase):
+    """The wire-format packer must match assigning number_value per element."""
+
+    def assert_matches_per_element(self, items):
+        list_msg = ListValue()
+        self.assertTrue(serializer._merge_number_list(list_msg, items))
+        self.assertEqual(list_msg.SerializeToString(), _per_element(items).SerializeToString())
+
+    def test_lengths_around_chunk_size(self):
+        chunk = serializer._NUMBER_CHUNK_SIZE
+        rng = random.Random(0)
+        for count in (serializer._NUMBER_BULK_MIN, chunk - 1, chunk, chunk + 1, 2 * chunk, 3 * chunk + 7):
+            with self.subTest(count=count):
+                self.assert_matches_per_element([rng.uniform(-1e6, 1e6) for _ in range(count)])
+
+    def test_mixed_ints_and_floats(self):
+        values = [0, -0.0, 1, 2.5, -3, 2 ** 60, 1e308, float('inf'), float('-inf'), float('nan')]
+        self.assert_matches_per_element(values * serializer._NUMBER_BULK_MIN)
+
+    def test_tuple_input(self):
+        self.assert_matches_per_element(tuple(range(serializer._NUMBER_CHUNK_SIZE + 3)))
+
+    def test_rejects_non_numeric_lists(self):
+        padding = [1] * serializer._NUMBER_BULK_MIN
+        for items in (padding + [True], padding + ['a'], padding + [None], ['a'] + padding, padding + [10 ** 400]):
+            with self.subTest(items=items):
+                list_msg = ListValue()
+                self.assertFalse(serializer._merge_number_list(list_msg, items))
+                self.assertEqual(len(list_msg.values), 0)
+
+    def test_short_lists_use_per_element_path(self):
+        for count in (0, 1, 3, 10, serializer._NUMBER_BULK_MIN - 1):
+            with self.subTest(count=count):
+                items = [float(i) for i in range(count)]
+                list_msg = ListValue()
+                self.assertFalse(serializer._merge_number_list(list_msg, items))
+                self.assertEqual(len(list_msg.values), 0)
+
+                struct_msg = Struct()
+                serializer._build_struct({'l': items}, struct_msg)
+                self.assertEqual(struct_msg['l'], _per_element(items))
+
+
+class StructPlanTest(unittest.TestCase):
+    """Plan-based filling must match _build_struct, however the payloads drift."""
+
+    def setUp(self):
+        serializer._plan_cache.clear()
+        serializer._seen_signatures.clear()
+
+    def assert_matches_build_struct(self, py_obj):
+        filled = Struct()
+        serializer._fill_struct(py_obj, filled)
+        expected = Struct()
+        serializer._build_struct(py_obj, expected)
+        self.assertEqual(filled, expected)
+
+    def test_plan_compiled_on_second_sighting(self):
+        payload = {'a': 1, 'b': {'c': 'x'}}
+        signature = ('a', 'b')
+        self.assert_matches_build_struct(payload)
+        self.assertNotIn(signature, serializer._plan_cache)
+        self.assertIn(signature, serializer._seen_signatures)
+
+        self.assert_matches_build_struct(payload)
+        self.assertIn(signature, serializer._plan_cache)
+        self.assertNotIn(signature, serializer._seen_signatures)
+
+    def test_wide_payloads_are_never_planned(self):
+        payload = {str(i): i for i in range(serializer._PLAN_MAX_KEYS + 1)}
+        for _ in range(3):
+            self.assert_matches_build_struct(payload)
+        self.assertFalse(serializer._plan_cache)
+        self.assertFalse(serializer._seen_signatures)
+
+    def test_lru_eviction(self):
+        with mock.patch.object(serializer, '_PLAN_CACHE_SIZE', 2):
+            for key in ('a', 'b', 'c'):
+                self.assert_matches_build_struct({key: 1})
+            self.assertEqual(list(serializer._seen_signatures), [('b',), ('c',)])
+
+            for key in ('b', 'c', 'b', 'd', 'd'):
+                self.assert_matches_build_struct({key: 1})
+            self.assertEqual(list(serializer._plan_cache), [('b',), ('d',)])
+
+    def test_drift_from_compiled_sample(self):
+        sample = {'a': 1, 'b': {'x': 's', 'y': [1.5]}, 'c': ['t'], 'd': [[1]]}
+        for _ in range(2):
+            self.assert_matches_build_struct(sample)
+        self.assertIn(('a', 'b', 'c', 'd'), serializer._plan_cache)
+
+        for payload in (
+            sample,
+            # Nested key renamed after earlier fields were filled: KeyError -> Clear() -> rebuild
+            {'a': 2, 'b': {'x': 's', 'z': [1.5]}, 'c': ['t'], 'd': [[1]]},
+            {'a': 2, 'b': {'x': 's'}, 'c': ['t'], 'd': [[1]]},
+            # Same keys, different types at every level
+            {'a': 'one', 'b': [1, 2], 'c': None, 'd': {'k': True}},
+            {'a': None, 'b': {'x': 7, 'y': ('u', None)}, 'c': [1, {'k': []}], 'd': [['v'], 2.5, []]},
+            {'a': True, 'b': {'y': [], 'x': {}}, 'c': [], 'd': [list(range(300))]},
+        ):
+            with self.subTest(payload=payload):
+                self.assert_matches_build_struct(payload)
+
+    def test_drifting_nested_keys_and_types(self):
+        rng = random.Random(0)
+        scalars = [None, True, False, 0, -2.5, 'text', '']
+
+        def random_value(depth):
+            kind = rng.randrange(4 if depth < 3 else 1)
+            if kind == 0:
+                return rng.choice(scalars)
+            if kind == 1:
+                return {rng.choice('xyz'): random_value(depth + 1) for _ in range(rng.randrange(3))}
+            if kind == 2:
+                return [random_value(depth + 1) for _ in range(rng.randrange(4))]
+            return tuple(rng.random() for _ in range(rng.randrange(3)))
+
+        for _ in range(500):
+            # Same top-level keys every time, so the plan is compiled once and reused
+            payload = {'id': rng.choice([1, 'one', None]), 'body': random_value(0), 'tags': random_value(1)}
+            with self.subTest(payload=payload):
+                self.assert_matches_build_struct(payload)
+        self.assertIn(('id', 'body', 'tags'), serializer._plan_cache)
+
+
+class JsonRoundTripTest(unittest.TestCase):
+    """load_data() followed by save_json() must keep NaN and Infinity, whichever codec is installed."""
+
+    def test_non_finite_numbers_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            input_path = os.path.join(tmp, "in.json")
+            output_path = os.path.join(tmp, "out.json")
+            with open(input_path, 'w', encoding='utf-8') as file:
+                file.write('{"nan": NaN, "inf": [Infinity, -Infinity], "none": null, "n": 1.5}')
+
+            for pretty in (False, True):
+                with self.subTest(pretty=pretty):
+                    json_serializer = serializer.GenericJsonProtobufSerializer(input_path)
+                    json_serializer.load_data()
+                    json_serializer.save_json(output_path, pretty=pretty)
+                    with open(output_path, encoding='utf-8') as file:
+                        data = json.load(file)
+                    self.assertTrue(math.isnan(data["nan"]))
+                    self.assertEqual(data["inf"], [math.inf, -math.inf])
+                    self.assertIsNone(data["none"])
+                    self.assertEqual(data["n"], 1.5)
+
+
+class WriteBytesTest(unittest.TestCase):
+    """Rewriting a protobuf file must never truncate a copy that is still memory-mapped."""
+
+    def test_overwrite_keeps_existing_mapping_intact(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "data.pb")
+            old = Struct()
+            old.update({"k": "v" * 100000})
+            serializer._write_bytes(path, old.SerializeToString())
+
+            with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                serializer._write_bytes(path, b'')
+                serializer._write_bytes(path, Struct().SerializeToString())
+                self.assertEqual(Struct.FromString(mapped[:]), old)
+
+            loaded = Struct()
+            serializer._parse_protobuf_file(path, loaded)
+            self.assertEqual(loaded, Struct())
+            self.assertEqual(os.listdir(tmp), ["data.pb"])
+
+    def test_failed_write_leaves_target_and_no_temp_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "data.pb")
+            serializer._write_bytes(path, b'old')
+            with self.assertRaises(TypeError):
+                serializer._write_bytes(path, None)
+            with open(path, 'rb') as file:
+                self.assertEqual(file.read(), b'old')
+            self.assertEqual(os.listdir(tmp), ["data.pb"])
+
+
+@unittest.skipIf(serializer.ijson is None, "ijson is not installed")
+class StreamStructTest(unittest.TestCase):
+    """The single-pass ijson converter must match the dict-based path."""
+
+    def assert_matches_dict_path(self, document):
+        streamed = serializer._stream_struct(io.BytesIO(document.encode('utf-8')))
+        expected = Struct()
+        serializer._build_struct(json.loads(document), expected)
+        self.assertEqual(streamed, expected)
+
+    def test_nested_values(self):
+        self.assert_matches_dict_path(
+            '{"s": "h\u00e9", "n": 1.5, "i": 3, "b": false, "z": null, "e": {}, "l": [],'
+            ' "nested": [[1, {"x": "y"}], null, true, {}, []]}'
+        )
+
+    def test_numbers_beyond_int64_and_double_range(self):
+        self.assert_matches_dict_path(
+            '{"id": 18446744073709551615, "neg": -99999999999999999999, "big": 1e400,'
+            ' "tiny": -1e-400, "l": [1e400, 18446744073709551616, 0.1]}'
+        )
+
+    def test_duplicate_keys_keep_last_value(self):
+        for document in (
+            '{"a": {"x": 1}, "a": {"y": 2}}',
+            '{"a": [1], "a": [2]}',
+            '{"a": 1, "a": {"y": []}}',
+            '{"a": {"b": {"c": 1}, "b": [{}]}, "l": [{"k": 1, "k": {}}]}',
+        ):
+            with self.subTest(document=document):
+                self.assert_matches_dict_path(document)
+
+
+if __name__ == "__main__":
+    unittest.main()